@@ -5,35 +5,44 @@ import sys
 import os
 import argparse
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# The only place the skill root is put on sys.path; llm/* import config from it
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
+import config
 from llm import models
-from llm.caller import call, call_parallel
-from llm.parse import parse_stdin
+from llm.parse import parse_stdin_stream
 from llm.session import (
     new_session, get_current_session, get_session_path, clear_session,
     get_current_step, create_next_step, save_step_data, load_step_data, get_session_context
 )
 
+# Used when config.py predates MAX_CONTEXT_CHARS
+DEFAULT_MAX_CONTEXT_CHARS = 24000
+
 
 # ============================================================================
 # Commands
 # ============================================================================
+# llm.caller (http.client, ssl, ...) is imported inside the commands that call
+# models, so status/clear start without the network stack.
 
 def cmd_single(args):
     """Query single model."""
+    from llm.caller import call
+
     if not args.model:
         print("ERROR: -M required (gpt|gemini|grok)")
         sys.exit(1)
 
-    stdin = _require_stdin()
-    data = parse_stdin(stdin)
+    data = _require_stdin()
     if not data["query"]:
         print("ERROR: No ===QUERY=== found")
         sys.exit(1)
 
     session_id, step = _get_or_create_session(args.session)
-    result = call(args.model, data["query"])
+    result = call(args.model, data["query"], cache=not args.no_cache)
 
     if not result["success"]:
         print(f"ERROR: {result['error']}")
@@ -51,35 +60,36 @@ def cmd_single(args):
 
 def cmd_council(args):
     """Query all models in parallel."""
-    stdin = _require_stdin()
-    data = parse_stdin(stdin)
+    from llm.caller import iter_parallel
+
+    data = _require_stdin()
     if not data["query"]:
         print("ERROR: No ===QUERY=== found")
         sys.exit(1)
 
     session_id, step = _get_or_create_session(args.session)
-    results = call_parallel(data["query"], add_confidence=args.confidence)
 
-    # Save
     step_data = {"query": data["query"]}
     if data["draft"]:
         step_data["draft"] = data["draft"]
-    for key, result in results.items():
-        if result["success"]:
-            step_data[key] = result["content"]
     save_step_data(step, step_data, session_id)
 
-    # Output
+    # Print and save each answer as soon as its model finishes - the writes
+    # happen while the slower models are still in flight
     print()
-    for result in results.values():
+    for key, result in iter_parallel(data["query"], add_confidence=args.confidence, cache=not args.no_cache):
+        if result["success"]:
+            save_step_data(step, {key: result["content"]}, session_id)
         _print_result(result)
+
     print(f"[{session_id} step {step}]")
 
 
 def cmd_probe(args):
     """Follow-up question with session context."""
-    stdin = _require_stdin()
-    data = parse_stdin(stdin)
+    from llm.caller import call
+
+    data = _require_stdin()
     if not data["query"]:
         print("ERROR: No ===QUERY=== found")
         sys.exit(1)
@@ -95,19 +105,12 @@ def cmd_probe(args):
         sys.exit(1)
 
     # Build context from session history
-    context = []
-    for step_info in get_session_context(session_id):
-        step_data = step_info["data"]
-        context.append(f"--- Step {step_info['step']} ---")
-        if "query" in step_data:
-            context.append(f"Q: {step_data['query']}")
-        for key in models.ALL_KEYS:
-            if key in step_data:
-                resp = step_data[key][:800] + "..." if len(step_data[key]) > 800 else step_data[key]
-                context.append(f"{models.name(key)}: {resp}")
-    context.append(f"\n--- New Q ---\n{data['query']}")
+    history = _probe_history(session_id)
+    prompt = f"\n--- New Q ---\n{data['query']}"
+    if history:
+        prompt = f"{history}\n\n{prompt}"
 
-    result = call(target, "\n\n".join(context), label="Probe")
+    result = call(target, prompt, label="Probe", cache=not args.no_cache)
     if not result["success"]:
         print(f"ERROR: {result['error']}")
         sys.exit(1)
@@ -121,6 +124,8 @@ def cmd_probe(args):
 
 def cmd_crossref(args):
     """Models critique each other's responses."""
+    from llm.caller import iter_parallel
+
     session_id = args.session or get_current_session()
     if not session_id:
         print("ERROR: No session")
@@ -131,7 +136,7 @@ def cmd_crossref(args):
 
     # Check for stdin draft
     if not sys.stdin.isatty():
-        data = parse_stdin(sys.stdin.read())
+        data = parse_stdin_stream(sys.stdin)
         if data["draft"] and "draft" not in step_data:
             save_step_data(current_step, {"draft": data["draft"]}, session_id)
             step_data["draft"] = data["draft"]
@@ -151,14 +156,12 @@ def cmd_crossref(args):
         sys.exit(1)
 
     # Build prompts (each model sees others' responses)
+    responded = [(k, f"{name}: {model_responses[k]}")
+                 for k, name in zip(models.ALL_KEYS, models.NAMES) if model_responses[k]]
+    claude = [f"Claude: {draft}"] if draft else []
     prompts = {}
     for key in models.ALL_KEYS:
-        others = []
-        if draft:
-            others.append(f"Claude: {draft}")
-        for k, v in model_responses.items():
-            if k != key and v:
-                others.append(f"{models.name(k)}: {v}")
+        others = claude + [text for k, text in responded if k != key]
 
         parts = []
         if query:
@@ -169,17 +172,14 @@ def cmd_crossref(args):
         parts.append("\n---\nComment on others' responses. Agree/disagree? What insights or errors do you see?")
         prompts[key] = "\n".join(parts)
 
-    results = call_parallel(prompts, label="Crossref")
-
     step = create_next_step(session_id)
-    new_step_data = {"query": "Crossref"}
+    save_step_data(step, {"query": "Crossref"}, session_id)
     print()
-    for key, result in results.items():
+    for key, result in iter_parallel(prompts, label="Crossref", cache=not args.no_cache):
         if result["success"]:
-            new_step_data[f"{key}_crossref"] = result["content"]
+            save_step_data(step, {f"{key}_crossref": result["content"]}, session_id)
         _print_result(result, suffix="Crossref")
 
-    save_step_data(step, new_step_data, session_id)
     print(f"[{session_id} step {step}]")
 
 
@@ -191,11 +191,16 @@ def cmd_status(args):
         sys.exit(1)
 
     path = get_session_path(session_id)
-    steps = sorted([d for d in os.listdir(path) if d.isdigit()], key=int)
+    # scandir entries carry the type from readdir - no extra stat per entry
+    with os.scandir(path) as it:
+        steps = sorted((e for e in it if e.name.isdigit() and e.is_dir(follow_symlinks=False)),
+                       key=lambda e: int(e.name))
     print(f"{session_id}: {len(steps)} steps")
     for step in steps:
-        files = [f.replace('.md', '') for f in os.listdir(os.path.join(path, step)) if f.endswith('.md')]
-        print(f"  {step}/: {', '.join(files)}")
+        with os.scandir(step.path) as it:
+            files = [e.name[:-3] if e.name.endswith('.md') else e.name[:-6]
+                     for e in it if e.name.endswith(('.md', '.md.gz'))]
+        print(f"  {step.name}/: {', '.join(files)}")
 
 
 def cmd_clear(args):
@@ -212,12 +217,12 @@ def cmd_clear(args):
 # Helpers
 # ============================================================================
 
-def _require_stdin() -> str:
-    """Require and return stdin content."""
+def _require_stdin() -> dict:
+    """Require stdin and return its parsed sections."""
     if sys.stdin.isatty():
         print("ERROR: Pipe stdin with ===QUERY===")
         sys.exit(1)
-    return sys.stdin.read()
+    return parse_stdin_stream(sys.stdin)
 
 
 def _get_or_create_session(session_arg: str = None) -> tuple:
@@ -237,19 +242,57 @@ def _get_or_create_session(session_arg: str = None) -> tuple:
     return session_id, step
 
 
+def _probe_history(session_id: str) -> str:
+    """
+    Session history for probe, capped at config.MAX_CONTEXT_CHARS.
+
+    Keeps step 1 (the original question) plus as many of the latest steps as fit.
+    """
+    budget = getattr(config, "MAX_CONTEXT_CHARS", DEFAULT_MAX_CONTEXT_CHARS)
+
+    # Responses are cut to 800 chars below - read one extra to know when to add "..."
+    # Blocks stay as line lists with their joined length; the text is joined once at the end
+    blocks = []
+    for step_info in get_session_context(session_id, max_chars=801):
+        step_data = step_info["data"]
+        lines = [f"--- Step {step_info['step']} ---"]
+        if "query" in step_data:
+            lines.append(f"Q: {step_data['query']}")
+        for key, name in zip(models.ALL_KEYS, models.NAMES):
+            if key in step_data:
+                resp = step_data[key][:800] + "..." if len(step_data[key]) > 800 else step_data[key]
+                lines.append(f"{name}: {resp}")
+        blocks.append((lines, sum(map(len, lines)) + 2 * (len(lines) - 1)))
+
+    head, tail = blocks[:1], []
+    used = sum(size for _, size in head)
+    for lines, size in reversed(blocks[1:]):
+        if used + size > budget:
+            break
+        tail.append((lines, size))
+        used += size
+    omitted = len(blocks) - len(head) - len(tail)
+    if omitted:
+        head.append(([f"--- ({omitted} earlier steps omitted) ---"], 0))
+
+    return "\n\n".join(line for lines, _ in head + tail[::-1] for line in lines)
+
+
 def _print_result(result: dict, suffix: str = ""):
     """Print formatted result."""
     name = result["name"]
     if suffix:
         name = f"{name} ({suffix})"
-    print(f"### {name}\n")
     if result["success"]:
-        print(f"{result['content']}\n")
+        body = result['content']
     else:
         # Show detailed error info so Claude knows what happened
         error = result.get('error', 'Unknown error')
         model = result.get('model', result.get('key', 'unknown'))
-        print(f"[ERROR] Call to {model} failed: {error}\n")
+        body = f"[ERROR] Call to {model} failed: {error}"
+    # One write + flush per result (streamed output stays in whole blocks)
+    sys.stdout.write(f"### {name}\n\n{body}\n\n")
+    sys.stdout.flush()
 
 
 # ============================================================================
@@ -286,6 +329,7 @@ Input format (stdin):
     parser.add_argument("-M", "--model", choices=models.ALL_KEYS)
     parser.add_argument("-S", "--session", help="Session ID")
     parser.add_argument("-c", "--confidence", action="store_true")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the API, bypassing the response cache")
 
     args = parser.parse_args()
 
@@ -3,8 +3,9 @@ LLM Call Package
 
 Modules:
     api.py     - Low-level HTTP call to LLM API
-    models.py  - Model configuration (resolve, name, ALL_KEYS)
-    caller.py  - High-level caller (call, call_parallel)
-    parse.py   - Input parsing (parse_stdin)
+    models.py  - Model configuration (resolve, name, resolve_pair, ALL_KEYS, NAMES)
+    caller.py  - High-level caller (call, call_parallel, iter_parallel)
+    cache.py   - Response cache (get, put)
+    parse.py   - Input parsing (parse_stdin, parse_stdin_stream)
     session.py - Session/step management
 """
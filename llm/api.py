@@ -1,29 +1,78 @@
 """Low-level LLM API call - HTTP only."""
 
+import email.utils
 import json
+import random
 import re
 import ssl
-import urllib.request
+import time
 import urllib.error
+import urllib.request
+from typing import Optional
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 
+# Optional: orjson parses/serializes bytes directly in C
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Built once - loading the CA bundle is the expensive part of a TLS context
+_SSL_CONTEXT = ssl.create_default_context()
+
+# Rate limits / transient upstream failures worth retrying
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRY_DELAY = 30  # seconds
+DEFAULT_MAX_RETRIES = 3  # used when config.py predates MAX_RETRIES
+
+_THINK_RE = re.compile(r'<think>.*?</think>\s*', re.DOTALL)
+
 
 def _strip_think_tags(content: str) -> str:
     """Remove <think>...</think> CoT blocks."""
-    return re.sub(r'<think>.*?</think>\s*', '', content, flags=re.DOTALL)
+    if '<think>' not in content:
+        return content
+    return _THINK_RE.sub('', content)
+
 
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    """Seconds to wait before retry: Retry-After if the server sent one, else backoff + jitter."""
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), _MAX_RETRY_DELAY)
+        except ValueError:
+            try:
+                when = email.utils.parsedate_to_datetime(retry_after)
+                return min(max(when.timestamp() - time.time(), 0.0), _MAX_RETRY_DELAY)
+            except (TypeError, ValueError):
+                pass
+    return min(2 ** attempt + random.random(), _MAX_RETRY_DELAY)
 
-def call_llm(model: str, prompt: str) -> dict:
+
+def _dumps(obj) -> bytes:
+    """Serialize to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(raw: bytes):
+    """Parse JSON from raw bytes (no intermediate str)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def call_llm(model: str, prompt: str, suffix: str = "") -> dict:
     """
     Make HTTP call to LLM API.
 
     Args:
         model: Full model string (e.g., "gpt-4-turbo")
         prompt: User prompt
+        suffix: Appended to the prompt in the request payload (e.g. confidence request)
 
     Returns:
         {"success": True, "content": "...", "model": "..."}
@@ -31,7 +80,7 @@ def call_llm(model: str, prompt: str) -> dict:
     """
     payload = {
         "model": model,
-        "messages": [{"role": "user", "content": prompt}],
+        "messages": [{"role": "user", "content": prompt + suffix if suffix else prompt}],
         "temperature": config.TEMPERATURE,
         "max_tokens": config.MAX_TOKENS,
     }
@@ -43,22 +92,34 @@ def call_llm(model: str, prompt: str) -> dict:
 
     req = urllib.request.Request(
         config.ENDPOINT,
-        data=json.dumps(payload).encode("utf-8"),
+        data=_dumps(payload),
         headers=headers,
         method="POST"
     )
 
+    max_retries = getattr(config, "MAX_RETRIES", DEFAULT_MAX_RETRIES)
     try:
-        with urllib.request.urlopen(req, timeout=config.TIMEOUT, context=ssl.create_default_context()) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-
-            if "choices" in result and result["choices"]:
-                content = _strip_think_tags(result["choices"][0]["message"]["content"])
-                return {"success": True, "content": content, "model": model}
-            elif "error" in result:
-                return {"success": False, "error": str(result["error"]), "model": model}
-            else:
-                return {"success": False, "error": "Unexpected response format", "model": model}
+        for attempt in range(max_retries + 1):
+            try:
+                with urllib.request.urlopen(req, timeout=config.TIMEOUT, context=_SSL_CONTEXT) as resp:
+                    raw = resp.read()
+                break
+            except urllib.error.HTTPError as e:
+                if e.code not in _RETRY_STATUSES or attempt == max_retries:
+                    raise
+                retry_after = e.headers.get("Retry-After")
+                e.close()
+                time.sleep(_retry_delay(attempt, retry_after))
+
+        result = _loads(raw)
+
+        if "choices" in result and result["choices"]:
+            content = _strip_think_tags(result["choices"][0]["message"]["content"])
+            return {"success": True, "content": content, "model": model}
+        elif "error" in result:
+            return {"success": False, "error": str(result["error"]), "model": model}
+        else:
+            return {"success": False, "error": "Unexpected response format", "model": model}
 
     except urllib.error.HTTPError as e:
         return {"success": False, "error": f"HTTP {e.code}: {e.read().decode('utf-8', errors='replace')[:200]}", "model": model}
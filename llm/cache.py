@@ -0,0 +1,82 @@
+"""Response cache keyed by (endpoint, model, settings, prompt)."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+import config
+
+# Used when config.py predates these settings
+DEFAULT_CACHE_DIR = "~/.cache/llm-call"
+DEFAULT_CACHE_TTL = 86400  # seconds
+
+# Same-process hits (e.g. a retried command in one run) skip the disk
+_MEMO = {}
+
+
+def _cache_dir() -> str:
+    return os.path.expanduser(getattr(config, "CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def _ttl() -> float:
+    return getattr(config, "CACHE_TTL", DEFAULT_CACHE_TTL)
+
+
+def cache_key(model: str, prompt: str, suffix: str = "") -> str:
+    """Hash everything that changes the model's answer (prompt + suffix as sent)."""
+    h = hashlib.sha256(f"{config.ENDPOINT}|{model}|{config.TEMPERATURE}|{config.MAX_TOKENS}|".encode("utf-8"))
+    h.update(prompt.encode("utf-8"))
+    h.update(suffix.encode("utf-8"))
+    return h.hexdigest()
+
+
+def get(model: str, prompt: str, suffix: str = "") -> Optional[str]:
+    """Return cached content, or None on miss/expiry/disabled cache."""
+    ttl = _ttl()
+    if ttl <= 0:
+        return None
+
+    key = cache_key(model, prompt, suffix)
+    if key in _MEMO:
+        return _MEMO[key]
+
+    path = os.path.join(_cache_dir(), f"{key}.json")
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            # Expired - remove it so the cache folder doesn't grow without bound
+            os.remove(path)
+            return None
+        with open(path, encoding="utf-8") as f:
+            content = json.load(f)["content"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+    _MEMO[key] = content
+    return content
+
+
+def put(model: str, prompt: str, content: str, suffix: str = ""):
+    """Store content atomically (write temp file, then rename)."""
+    if _ttl() <= 0:
+        return
+
+    key = cache_key(model, prompt, suffix)
+    _MEMO[key] = content
+
+    cache_dir = _cache_dir()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"model": model, "content": content}, f)
+            os.replace(tmp, os.path.join(cache_dir, f"{key}.json"))
+        except OSError:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        # Caching is best-effort - never fail a call over it
+        pass
@@ -1,24 +1,50 @@
 """Unified LLM caller - single and parallel execution."""
 
+import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 
 from llm.api import call_llm
+from llm import cache as response_cache
 from llm import models
 
 
+def _pool_size() -> int:
+    """
+    Worker count for the shared pool.
+
+    MAX_WORKERS (or $LLM_COUNCIL_WORKERS), capped at one thread per model and at the
+    usual I/O-bound ceiling of 4 x CPUs / 32 threads.
+    """
+    try:
+        wanted = int(os.environ.get("LLM_COUNCIL_WORKERS") or config.MAX_WORKERS)
+    except ValueError:
+        wanted = config.MAX_WORKERS
+    return max(1, min(wanted, len(config.MODELS), (os.cpu_count() or 1) * 4, 32))
+
+
+# Shared by every fan-out in this process; threads are started on demand and kept warm
+_POOL = ThreadPoolExecutor(max_workers=_pool_size(), thread_name_prefix="llm-call")
+
+CONFIDENCE_SUFFIX = "\n\n---\nAfter answering, rate your confidence (high/medium/low) for each claim."
+
+
 def _log(msg: str):
     """Print debug message if enabled."""
     if config.DEBUG_OUTPUT:
         print(msg)
 
 
-def call(key: str, prompt: str, label: str = "") -> dict:
+def _status(result: dict) -> str:
+    """Progress status for a result."""
+    if not result.get("success"):
+        return "FAILED"
+    return "OK (cached)" if result.get("cached") else "OK"
+
+
+def call(key: str, prompt: str, label: str = "", cache: bool = True, suffix: str = "") -> dict:
     """
     Call a single model.
 
@@ -26,6 +52,8 @@ def call(key: str, prompt: str, label: str = "") -> dict:
         key: Model key (gpt, gemini, grok, qwen)
         prompt: The prompt
         label: Optional label for progress output (e.g., "Probe", "Crossref")
+        cache: Serve/store the response from the response cache
+        suffix: Text appended to the prompt when the request is sent
 
     Returns:
         {"success": bool, "content": str, "error": str, "key": str, "name": str}
@@ -33,35 +61,31 @@ def call(key: str, prompt: str, label: str = "") -> dict:
     display = f"{label}: " if label else ""
     _log(f"[llm-call] {display}Calling {models.name(key)}...")
 
-    try:
-        result = call_llm(models.resolve(key), prompt)
-        result["key"] = key
-        result["name"] = models.name(key)
-    except Exception as e:
-        result = {"success": False, "error": str(e), "key": key, "name": models.name(key)}
+    result = _call_single(key, prompt, cache, suffix)
 
-    status = "OK" if result.get("success") else "FAILED"
-    _log(f"[llm-call] {display}{models.name(key)}: {status}")
+    _log(f"[llm-call] {display}{models.name(key)}: {_status(result)}")
     return result
 
 
-def call_parallel(
+def iter_parallel(
     prompts: Union[str, Dict[str, str]],
     keys: Optional[List[str]] = None,
     label: str = "",
-    add_confidence: bool = False
-) -> Dict[str, dict]:
+    add_confidence: bool = False,
+    cache: bool = True
+) -> Iterator[Tuple[str, dict]]:
     """
-    Call multiple models in parallel.
+    Call multiple models in parallel, yielding results as each one finishes.
 
     Args:
         prompts: Either a single prompt string (same for all) or dict {key: prompt}
         keys: Model keys to call (default: all). Ignored if prompts is dict.
         label: Label for progress output
         add_confidence: Append confidence request to prompt
+        cache: Serve/store responses from the response cache
 
-    Returns:
-        Dict mapping key -> result dict
+    Yields:
+        (key, result dict) in completion order
     """
     # Normalize to dict form
     if isinstance(prompts, str):
@@ -70,41 +94,75 @@ def call_parallel(
     else:
         prompt_dict = prompts
 
-    # Add confidence suffix if requested
-    if add_confidence:
-        suffix = "\n\n---\nAfter answering, rate your confidence (high/medium/low) for each claim."
-        prompt_dict = {k: v + suffix for k, v in prompt_dict.items()}
+    # Confidence request is appended when each payload is built, not copied into every prompt
+    suffix = CONFIDENCE_SUFFIX if add_confidence else ""
 
     display = f"{label}: " if label else ""
-    results = {}
 
-    max_workers = min(config.MAX_WORKERS, len(prompt_dict))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
+    # A lone call gains nothing from a worker thread - run it inline
+    if len(prompt_dict) <= 1:
         for key, prompt in prompt_dict.items():
+            yield key, call(key, prompt, label=label, cache=cache, suffix=suffix)
+        return
+
+    # Keys that resolve to the same model with the same prompt share one request
+    groups = {}
+    for key, prompt in prompt_dict.items():
+        groups.setdefault((models.resolve(key), prompt), []).append(key)
+
+    futures = {}
+    for (_, prompt), group in groups.items():
+        for key in group:
             _log(f"[llm-call] {display}Queuing {models.name(key)}...")
-            futures[executor.submit(_call_single, key, prompt)] = key
+        futures[_POOL.submit(_call_single, group[0], prompt, cache, suffix)] = group
 
-        for future in as_completed(futures):
-            key = futures[future]
-            try:
-                result = future.result()
-            except Exception as e:
-                result = {"success": False, "error": str(e), "key": key, "name": models.name(key)}
+    for future in as_completed(futures):
+        group = futures[future]
+        try:
+            shared = future.result()
+        except Exception as e:
+            shared = {"success": False, "error": str(e)}
 
-            results[key] = result
-            status = "OK" if result.get("success") else "FAILED"
-            _log(f"[llm-call] {display}{models.name(key)}: {status}")
+        for key in group:
+            result = {**shared, "key": key, "name": models.name(key)}
+            _log(f"[llm-call] {display}{models.name(key)}: {_status(result)}")
+            yield key, result
 
-    return results
 
+def call_parallel(
+    prompts: Union[str, Dict[str, str]],
+    keys: Optional[List[str]] = None,
+    label: str = "",
+    add_confidence: bool = False,
+    cache: bool = True
+) -> Dict[str, dict]:
+    """
+    Call multiple models in parallel and wait for all of them.
 
-def _call_single(key: str, prompt: str) -> dict:
+    Same arguments as iter_parallel.
+
+    Returns:
+        Dict mapping key -> result dict (in completion order)
+    """
+    return dict(iter_parallel(prompts, keys=keys, label=label, add_confidence=add_confidence, cache=cache))
+
+
+def _call_single(key: str, prompt: str, cache: bool = True, suffix: str = "") -> dict:
     """Internal: call without progress output (for parallel use)."""
+    model, display = models.resolve_pair(key)
+    if cache:
+        content = response_cache.get(model, prompt, suffix)
+        if content is not None:
+            return {"success": True, "content": content, "model": model,
+                    "key": key, "name": display, "cached": True}
+
     try:
-        result = call_llm(models.resolve(key), prompt)
+        result = call_llm(model, prompt, suffix)
         result["key"] = key
-        result["name"] = models.name(key)
-        return result
+        result["name"] = display
     except Exception as e:
-        return {"success": False, "error": str(e), "key": key, "name": models.name(key)}
+        return {"success": False, "error": str(e), "key": key, "name": display}
+
+    if cache and result.get("success"):
+        response_cache.put(model, prompt, result["content"], suffix)
+    return result
@@ -1,19 +1,31 @@
 """Model configuration helpers."""
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import functools
+
 import config
 
-# All available model keys
-ALL_KEYS = list(config.MODELS.keys())
+# All available model keys, snapshotted at import (config is not changed at runtime)
+ALL_KEYS = tuple(config.MODELS)
 
 
+@functools.lru_cache(maxsize=64)
 def resolve(key: str) -> str:
     """Resolve model key to full model string."""
     return config.MODELS.get(key.lower(), key)
 
 
+@functools.lru_cache(maxsize=64)
 def name(key: str) -> str:
     """Get display name for model key."""
     return config.MODEL_NAMES.get(key.lower(), key)
+
+
+@functools.lru_cache(maxsize=64)
+def resolve_pair(key: str) -> tuple:
+    """(full model string, display name) for model key, from one lowercase lookup."""
+    lk = key.lower()
+    return config.MODELS.get(lk, key), config.MODEL_NAMES.get(lk, key)
+
+
+# Display names, parallel to ALL_KEYS
+NAMES = tuple(name(k) for k in ALL_KEYS)
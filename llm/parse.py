@@ -1,59 +1,87 @@
 """Input parsing utilities."""
 
-from typing import Optional
+import re
+from typing import Dict, Iterable, Optional
 from llm import models
 
 
-def parse_stdin(content: str) -> dict:
+_MARKERS = (("===QUERY===", "query"), ("===DRAFT===", "draft"), ("===PROBE===", "probe"))
+_SECTION_RE = re.compile(r"===(QUERY|DRAFT|PROBE)===")
+
+# @<key> mentions in the probe line, for any configured key (keys may contain any
+# character; longest first, so "@gpt4.1" isn't taken as "@gpt")
+_PROBE_KEYS = {k.lower(): k for k in models.ALL_KEYS}
+_PROBE_TARGET_RE = re.compile(
+    "@(" + "|".join(re.escape(k) for k in sorted(_PROBE_KEYS, key=len, reverse=True)) + ")")
+
+
+def parse_stdin_stream(fp: Iterable[str]) -> dict:
     """
-    Parse stdin content with section markers.
+    Parse section markers line by line, without reading the whole input first.
 
     Supported markers:
         ===QUERY=== - The question/prompt (required for most modes)
         ===DRAFT=== - Claude's draft answer (optional)
         ===PROBE=== - Target model for probe (optional)
 
+    Text before the first marker is ignored; a repeated marker is kept as text.
+
     Returns:
         {"query": str|None, "draft": str|None, "probe_model": str|None}
     """
-    result = {"query": None, "draft": None, "probe_model": None}
+    sections = {}
+    current = None
+
+    for line in fp:
+        while "===" in line:
+            # Earliest marker on this line that hasn't started a section yet
+            hits = [(line.find(m), m, name) for m, name in _MARKERS if name not in sections and m in line]
+            if not hits:
+                break
+            pos, marker, name = min(hits)
+            if current is not None:
+                sections[current].append(line[:pos])
+            current = name
+            sections[name] = []
+            line = line[pos + len(marker):]
+        if current is not None:
+            sections[current].append(line)
 
-    # Parse QUERY
-    if "===QUERY===" in content:
-        remaining = content.split("===QUERY===", 1)[1]
-
-        # Check for DRAFT section
-        if "===DRAFT===" in remaining:
-            query_part, draft_part = remaining.split("===DRAFT===", 1)
-            result["query"] = query_part.strip()
-            # Draft might have PROBE after it
-            if "===PROBE===" in draft_part:
-                draft_part, probe_part = draft_part.split("===PROBE===", 1)
-                result["probe_model"] = _parse_probe_target(probe_part)
-            result["draft"] = draft_part.strip()
-        elif "===PROBE===" in remaining:
-            query_part, probe_part = remaining.split("===PROBE===", 1)
-            result["query"] = query_part.strip()
-            result["probe_model"] = _parse_probe_target(probe_part)
-        else:
-            result["query"] = remaining.strip()
-
-    # Parse standalone DRAFT (for crossref)
-    elif "===DRAFT===" in content:
-        result["draft"] = content.split("===DRAFT===", 1)[1].strip()
-
-    # Parse PROBE target
-    if "===PROBE===" in content and result["probe_model"] is None:
-        probe_part = content.split("===PROBE===", 1)[1]
-        result["probe_model"] = _parse_probe_target(probe_part)
+    return _result({name: "".join(parts) for name, parts in sections.items()})
 
+
+def parse_stdin(content: str) -> dict:
+    """Parse already-read stdin content in one regex pass (same rules as parse_stdin_stream)."""
+    # First occurrence of each marker starts its section
+    starts = []
+    seen = set()
+    for m in _SECTION_RE.finditer(content):
+        name = m.group(1).lower()
+        if name not in seen:
+            seen.add(name)
+            starts.append((m.start(), m.end(), name))
+
+    sections = {}
+    for i, (_, body_start, name) in enumerate(starts):
+        body_end = starts[i + 1][0] if i + 1 < len(starts) else len(content)
+        sections[name] = content[body_start:body_end]
+    return _result(sections)
+
+
+def _result(sections: Dict[str, str]) -> dict:
+    """Build the parse result from raw section texts."""
+    result = {"query": None, "draft": None, "probe_model": None}
+    if "query" in sections:
+        result["query"] = sections["query"].strip()
+    if "draft" in sections:
+        result["draft"] = sections["draft"].strip()
+    if "probe" in sections:
+        result["probe_model"] = _parse_probe_target(sections["probe"])
     return result
 
 
 def _parse_probe_target(probe_content: str) -> Optional[str]:
     """Extract model key from probe section (e.g., @gpt)."""
-    first_line = probe_content.strip().split('\n')[0].lower()
-    for key in models.ALL_KEYS:
-        if f"@{key}" in first_line:
-            return key
-    return None
+    first_line = probe_content.strip().split('\n', 1)[0].lower()
+    match = _PROBE_TARGET_RE.search(first_line)
+    return _PROBE_KEYS.get(match.group(1)) if match else None
@@ -2,13 +2,40 @@
 
 import os
 import json
+import functools
+import time
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 
-import sys
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 
+# Step files longer than this (chars) are stored as <key>.md.gz
+GZIP_THRESHOLD = 4096
+
+# .current is re-read at most this often (seconds); our own writes update it directly
+_CURRENT_TTL = 0.2
+_current = None  # (monotonic time, session ID or None)
+
+# metadata.json path -> (st_mtime_ns, parsed metadata)
+_META_CACHE = {}
+
+
+def _write_atomic(path: str, content: Union[str, bytes]):
+    """Write file via temp file + rename, so readers never see a partial write."""
+    import tempfile
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        if isinstance(content, bytes):
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
 
 def get_session_dir() -> str:
     """Get session directory, create if needed."""
@@ -19,34 +46,52 @@ def get_session_dir() -> str:
 def new_session() -> str:
     """Create new session with step 1, return ID."""
     session_id = f"s_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
-    session_path = os.path.join(get_session_dir(), session_id)
-    os.makedirs(session_path, exist_ok=True)
+    session_dir = get_session_dir()
+    session_path = os.path.join(session_dir, session_id)
 
-    # Create step 1 folder
+    # Create session + step 1 folder in one go
     os.makedirs(os.path.join(session_path, "1"), exist_ok=True)
 
     # Mark as current
-    with open(os.path.join(get_session_dir(), ".current"), "w") as f:
-        f.write(session_id)
+    _write_atomic(os.path.join(session_dir, ".current"), session_id)
+    _set_current(session_id)
 
     # Write metadata
     metadata = {
         "created": datetime.now().isoformat(),
         "current_step": 1
     }
-    with open(os.path.join(session_path, "metadata.json"), "w") as f:
-        json.dump(metadata, f, indent=2)
+    _save_metadata(os.path.join(session_path, "metadata.json"), metadata)
 
     return session_id
 
 
+def _set_current(session_id: Optional[str]):
+    global _current
+    _current = (time.monotonic(), session_id)
+
+
 def get_current_session() -> Optional[str]:
     """Get current session ID."""
+    if _current is not None and time.monotonic() - _current[0] < _CURRENT_TTL:
+        return _current[1]
+
     current_file = os.path.join(get_session_dir(), ".current")
+    session_id = None
     if os.path.exists(current_file):
-        with open(current_file) as f:
-            return f.read().strip()
-    return None
+        with open(current_file, encoding="utf-8") as f:
+            session_id = f.read().strip()
+    _set_current(session_id)
+    return session_id
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_session_path(session_id: str) -> str:
+    """Existing session folder for ID (misses raise, so they are never cached)."""
+    path = os.path.join(get_session_dir(), session_id)
+    if not os.path.isdir(path):
+        raise ValueError(f"Session not found: {session_id}")
+    return path
 
 
 def get_session_path(session_id: Optional[str] = None) -> str:
@@ -55,11 +100,15 @@ def get_session_path(session_id: Optional[str] = None) -> str:
         session_id = get_current_session()
     if session_id is None:
         raise ValueError("No active session. Run init first.")
-    
-    path = os.path.join(get_session_dir(), session_id)
-    if not os.path.isdir(path):
-        raise ValueError(f"Session not found: {session_id}")
-    return path
+    return _resolve_session_path(session_id)
+
+
+@functools.lru_cache(maxsize=64)
+def _step_dir(session_path: str, step: int) -> str:
+    """Step folder path, created on first use (council/crossref save once per model)."""
+    step_path = os.path.join(session_path, str(step))
+    os.makedirs(step_path, exist_ok=True)
+    return step_path
 
 
 def clear_session(session_id: Optional[str] = None):
@@ -67,6 +116,8 @@ def clear_session(session_id: Optional[str] = None):
     import shutil
     path = get_session_path(session_id)
     shutil.rmtree(path, ignore_errors=True)
+    _resolve_session_path.cache_clear()
+    _step_dir.cache_clear()
     
     # Clear current marker if this was current
     current = get_current_session()
@@ -74,16 +125,36 @@ def clear_session(session_id: Optional[str] = None):
         current_file = os.path.join(get_session_dir(), ".current")
         if os.path.exists(current_file):
             os.remove(current_file)
+        _set_current(None)
+
+
+def _load_metadata(metadata_file: str) -> Optional[dict]:
+    """Parsed metadata.json (copy), re-read only when its mtime changes; None if missing."""
+    try:
+        mtime = os.stat(metadata_file).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _META_CACHE.get(metadata_file)
+    if cached is None or cached[0] != mtime:
+        with open(metadata_file, encoding="utf-8") as f:
+            cached = (mtime, json.load(f))
+        _META_CACHE[metadata_file] = cached
+    return dict(cached[1])
+
+
+def _save_metadata(metadata_file: str, metadata: dict):
+    """Write metadata.json and keep the cache in step with it."""
+    _write_atomic(metadata_file, json.dumps(metadata, indent=2))
+    _META_CACHE[metadata_file] = (os.stat(metadata_file).st_mtime_ns, dict(metadata))
 
 
 def get_current_step(session_id: Optional[str] = None) -> int:
     """Get current step number for session."""
     path = get_session_path(session_id)
-    metadata_file = os.path.join(path, "metadata.json")
-    if os.path.exists(metadata_file):
-        with open(metadata_file) as f:
-            metadata = json.load(f)
-            return metadata.get("current_step", 1)
+    metadata = _load_metadata(os.path.join(path, "metadata.json"))
+    if metadata is not None:
+        return metadata.get("current_step", 1)
     return 1
 
 
@@ -94,22 +165,18 @@ def create_next_step(session_id: Optional[str] = None) -> int:
     next_step = current_step + 1
 
     # Create new step folder
-    step_path = os.path.join(path, str(next_step))
-    os.makedirs(step_path, exist_ok=True)
+    _step_dir(path, next_step)
 
     # Update metadata
     metadata_file = os.path.join(path, "metadata.json")
-    if os.path.exists(metadata_file):
-        with open(metadata_file) as f:
-            metadata = json.load(f)
-    else:
+    metadata = _load_metadata(metadata_file)
+    if metadata is None:
         metadata = {"created": datetime.now().isoformat()}
 
     metadata["current_step"] = next_step
     metadata["last_updated"] = datetime.now().isoformat()
 
-    with open(metadata_file, "w") as f:
-        json.dump(metadata, f, indent=2)
+    _save_metadata(metadata_file, metadata)
 
     return next_step
 
@@ -119,43 +186,71 @@ def save_step_data(step: int, data: Dict[str, str], session_id: Optional[str] =
     Save data to step folder.
     data keys: query, draft, gpt, gemini, grok
     """
-    path = get_session_path(session_id)
-    step_path = os.path.join(path, str(step))
-    os.makedirs(step_path, exist_ok=True)
+    step_path = _step_dir(get_session_path(session_id), step)
 
     for key, content in data.items():
         if content:
-            filename = f"{key}.md"
-            with open(os.path.join(step_path, filename), "w", encoding="utf-8") as f:
-                f.write(content)
+            plain = os.path.join(step_path, f"{key}.md")
+            # Long responses are stored gzipped; drop whichever variant this write replaces
+            if len(content) > GZIP_THRESHOLD:
+                import gzip
+                _write_atomic(plain + ".gz", gzip.compress(content.encode("utf-8"), compresslevel=1))
+                stale = plain
+            else:
+                _write_atomic(plain, content)
+                stale = plain + ".gz"
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+
+def _read_step_dir(step_path: str, max_chars: Optional[int] = None, full_keys: tuple = ("query",)) -> Dict[str, str]:
+    """Read every step file in one scandir pass (missing folder -> empty dict)."""
+    data = {}
+    try:
+        it = os.scandir(step_path)
+    except FileNotFoundError:
+        return data
+
+    with it:
+        for entry in it:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            if entry.name.endswith(".md"):
+                key = entry.name[:-3]  # Remove .md
+                opener = open
+            elif entry.name.endswith(".md.gz"):
+                import gzip
+                key = entry.name[:-6]  # Remove .md.gz
+                opener = gzip.open
+            else:
+                continue
+            limit = -1 if max_chars is None or key in full_keys else max_chars
+            with opener(entry.path, "rt", encoding="utf-8") as f:
+                data[key] = f.read(limit)
 
+    return data
 
-def load_step_data(step: int, session_id: Optional[str] = None) -> Dict[str, str]:
-    """Load all data from a step folder."""
-    path = get_session_path(session_id)
-    step_path = os.path.join(path, str(step))
 
-    data = {}
-    if os.path.isdir(step_path):
-        for filename in os.listdir(step_path):
-            if filename.endswith(".md"):
-                key = filename[:-3]  # Remove .md
-                with open(os.path.join(step_path, filename), encoding="utf-8") as f:
-                    data[key] = f.read()
+def load_step_data(step: int, session_id: Optional[str] = None,
+                   max_chars: Optional[int] = None, full_keys: tuple = ("query",)) -> Dict[str, str]:
+    """
+    Load all data from a step folder.
 
-    return data
+    If max_chars is set, only the first max_chars characters of each file are read,
+    except for keys in full_keys.
+    """
+    step_path = os.path.join(get_session_path(session_id), str(step))
+    return _read_step_dir(step_path, max_chars, full_keys)
 
 
-def get_session_context(session_id: Optional[str] = None) -> list:
-    """Get all steps' data for building probe context."""
+def get_session_context(session_id: Optional[str] = None, max_chars: Optional[int] = None) -> list:
+    """Get all steps' data for building probe context (max_chars as in load_step_data)."""
     path = get_session_path(session_id)
-    steps = []
-
-    # Find all step folders
-    for item in sorted(os.listdir(path)):
-        if item.isdigit() and os.path.isdir(os.path.join(path, item)):
-            step_num = int(item)
-            step_data = load_step_data(step_num, session_id)
-            steps.append({"step": step_num, "data": step_data})
 
-    return steps
+    # Find all step folders, in numeric order ("10" after "2"); scandir already knows which are dirs
+    with os.scandir(path) as it:
+        entries = sorted((int(e.name), e.path) for e in it
+                         if e.name.isdigit() and e.is_dir(follow_symlinks=False))
+    return [{"step": n, "data": _read_step_dir(p, max_chars)} for n, p in entries]